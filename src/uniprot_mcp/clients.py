@@ -1,20 +1,40 @@
 """Client factory for selecting the appropriate UniProt database client."""
 
+import re
 from typing import Literal
 
 from unipressed import UniprotkbClient, UniparcClient, UnirefClient
 
 DatabaseType = Literal["uniprotkb", "uniparc", "uniref"]
 
-VALID_DATABASES: set[DatabaseType] = {"uniprotkb", "uniparc", "uniref"}
-
 # Map database names to their client classes
-CLIENT_MAP = {
+CLIENT_MAP: dict[DatabaseType, type] = {
     "uniprotkb": UniprotkbClient,
     "uniparc": UniparcClient,
     "uniref": UnirefClient,
 }
 
+VALID_DATABASES: frozenset[DatabaseType] = frozenset(CLIENT_MAP)
+
+# Identifier formats for each database. UniProt rejects a whole bulk request
+# if any ID in it is malformed, so IDs are checked before they are sent.
+_UNIPROTKB_ACCESSION = (
+    r"(?:[OPQ][0-9][A-Z0-9]{3}[0-9]|[A-NR-Z][0-9](?:[A-Z][A-Z0-9]{2}[0-9]){1,2})"
+    r"(?:-\d+)?"
+)
+_UNIPARC_ID = r"UPI[0-9A-F]{10}"
+
+ID_PATTERNS: dict[DatabaseType, re.Pattern[str]] = {
+    "uniprotkb": re.compile(_UNIPROTKB_ACCESSION),
+    "uniparc": re.compile(_UNIPARC_ID),
+    "uniref": re.compile(rf"UniRef(?:100|90|50)_(?:{_UNIPROTKB_ACCESSION}|{_UNIPARC_ID})"),
+}
+
+_UNIREF_PREFIX = "UniRef"
+
+# Listed in a stable order so error messages are deterministic
+_DB_ERROR_SUFFIX = ", ".join(sorted(VALID_DATABASES))
+
 
 def get_client(database: DatabaseType):
     """
@@ -29,11 +49,12 @@ def get_client(database: DatabaseType):
     Raises:
         ValueError: If the database is not supported.
     """
-    if database not in VALID_DATABASES:
+    try:
+        return CLIENT_MAP[database]
+    except KeyError:
         raise ValueError(
-            f"Invalid database '{database}'. Must be one of: {', '.join(VALID_DATABASES)}"
-        )
-    return CLIENT_MAP[database]
+            f"Invalid database '{database}'. Must be one of: {_DB_ERROR_SUFFIX}"
+        ) from None
 
 
 def validate_database(database: str) -> DatabaseType:
@@ -50,9 +71,32 @@ def validate_database(database: str) -> DatabaseType:
         ValueError: If the database is not supported.
     """
     db_lower = database.lower()
-    if db_lower not in VALID_DATABASES:
+    if db_lower not in CLIENT_MAP:
         raise ValueError(
-            f"Invalid database '{database}'. Must be one of: {', '.join(VALID_DATABASES)}"
+            f"Invalid database '{database}'. Must be one of: {_DB_ERROR_SUFFIX}"
         )
     return db_lower  # type: ignore
 
+
+def normalise_id(database: DatabaseType, id_: str) -> str | None:
+    """
+    Normalise an ID to UniProt's canonical case and check its format.
+
+    Accessions and UniParc IDs are upper-cased; UniRef IDs keep a
+    case-insensitive "UniRef" prefix and upper-case the member ID after it.
+
+    Args:
+        database: The database the ID belongs to.
+        id_: The ID to normalise, already stripped of whitespace.
+
+    Returns:
+        The normalised ID, or None if it is not a valid ID for the database.
+    """
+    if database == "uniref":
+        prefix, sep, member = id_.partition("_")
+        if prefix[: len(_UNIREF_PREFIX)].lower() == _UNIREF_PREFIX.lower():
+            prefix = _UNIREF_PREFIX + prefix[len(_UNIREF_PREFIX) :]
+        candidate = f"{prefix}{sep}{member.upper()}"
+    else:
+        candidate = id_.upper()
+    return candidate if ID_PATTERNS[database].fullmatch(candidate) else None
@@ -1,9 +1,22 @@
 """Cursor-based pagination utilities for UniProt MCP server."""
 
 import base64
-import json
+import binascii
 from typing import Any
 
+# Cursors carry the offset as a fixed-width big-endian integer
+_CURSOR_WIDTH = 8
+
+
+def _raw_encode(offset: int) -> str:
+    """Encode an offset without consulting the cursor cache."""
+    raw = offset.to_bytes(_CURSOR_WIDTH, "big", signed=True)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+# Pre-encoded cursors for the offsets reached by ordinary pagination
+_CURSOR_CACHE: tuple[str, ...] = tuple(_raw_encode(i) for i in range(4096))
+
 
 def encode_cursor(offset: int) -> str:
     """
@@ -13,11 +26,11 @@ def encode_cursor(offset: int) -> str:
         offset: The current offset position in the result set.
 
     Returns:
-        A base64-encoded cursor string.
+        An unpadded urlsafe base64-encoded cursor string.
     """
-    cursor_data = {"offset": offset}
-    json_bytes = json.dumps(cursor_data).encode("utf-8")
-    return base64.urlsafe_b64encode(json_bytes).decode("ascii")
+    if 0 <= offset < len(_CURSOR_CACHE):
+        return _CURSOR_CACHE[offset]
+    return _raw_encode(offset)
 
 
 def decode_cursor(cursor: str) -> int:
@@ -34,16 +47,16 @@ def decode_cursor(cursor: str) -> int:
         ValueError: If the cursor is invalid or malformed.
     """
     try:
-        json_bytes = base64.urlsafe_b64decode(cursor.encode("ascii"))
-        cursor_data = json.loads(json_bytes.decode("utf-8"))
-        if "offset" not in cursor_data:
-            raise ValueError("Cursor missing 'offset' field")
-        offset = cursor_data["offset"]
-        if not isinstance(offset, int) or offset < 0:
-            raise ValueError("Invalid offset value in cursor")
-        return offset
-    except (json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+    except (UnicodeEncodeError, binascii.Error) as e:
         raise ValueError(f"Invalid cursor format: {e}") from e
+    if len(raw) != _CURSOR_WIDTH:
+        raise ValueError("Invalid cursor format: unexpected length")
+    offset = int.from_bytes(raw, "big", signed=True)
+    if offset < 0:
+        raise ValueError("Invalid offset value in cursor")
+    return offset
 
 
 def paginate_results(
@@ -69,12 +82,12 @@ def paginate_results(
     if total_available is not None:
         response["total"] = total_available
 
-    # If we got a full page of results, there might be more
-    if len(results) == limit:
-        next_offset = offset + limit
-        # Only add nextCursor if we haven't reached the end
-        if total_available is None or next_offset < total_available:
-            response["nextCursor"] = encode_cursor(next_offset)
+    # A full page means there might be more, unless the total says otherwise
+    next_offset = offset + limit
+    if len(results) == limit and (
+        total_available is None or next_offset < total_available
+    ):
+        response["nextCursor"] = encode_cursor(next_offset)
 
     return response
 
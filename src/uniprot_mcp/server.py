@@ -1,36 +1,60 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
+#     "cachetools>=5.0.0",
 #     "fastmcp>=2.0.0,<3.0.0",
+#     "requests>=2.0.0",
 #     "toon-format>=0.9.0b1",
 #     "unipressed>=1.4.0,<2.0.0",
 # ]
 # ///
 """UniProt MCP Server - FastMCP server providing UniProt search and fetch tools."""
 
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from importlib.resources import files
+from itertools import islice
+from threading import Lock
 from typing import Any, Literal
 
+import requests
+from cachetools import TTLCache, cached
 from fastmcp import FastMCP
-from toon_format import encode
+from toon_format import encode as _toon_encode
 
-from uniprot_mcp.clients import get_client, validate_database, VALID_DATABASES
+from uniprot_mcp.clients import get_client, normalise_id, validate_database, VALID_DATABASES
 from uniprot_mcp.pagination import decode_cursor, paginate_results
 
+_VALID_FORMATS = frozenset({"toon", "json"})
 
-def _format_response(data: dict[str, Any], response_format: str) -> str | dict[str, Any]:
+# Accessions per fetch request, keeping query URLs well under UniProt's limits
+_FETCH_CHUNK_SIZE = 50
+_FETCH_MAX_WORKERS = 8
+
+# HTTP statuses UniProt uses for accessions it cannot find
+_NOT_FOUND_STATUSES = frozenset({400, 404})
+
+# Recent tool responses, so retried or repeated calls skip the network.
+# Bounded by approximate serialised size, since full entries are tens of KB each.
+_RESPONSE_CACHE_MAX_CHARS = 64 * 1024 * 1024
+_RESPONSE_CACHE_TTL = 300  # seconds
+
+
+@cache
+def _load_description(name: str) -> str:
     """
-    Format response data based on the requested format.
-    
+    Load a tool description from the packaged descriptions directory.
+
     Args:
-        data: The response data dictionary
-        response_format: The format to use ('toon' or 'json')
-    
+        name: The description name, e.g. 'search' or 'fetch'.
+
     Returns:
-        TOON-formatted string if response_format='toon', otherwise the original dict
+        The description text.
     """
-    if response_format == "toon":
-        return encode(data)
-    return data
+    return (files("uniprot_mcp") / "descriptions" / f"{name}.txt").read_text(
+        encoding="utf-8"
+    )
 
 
 # Create the FastMCP server instance
@@ -49,234 +73,15 @@ mcp = FastMCP(
 )
 
 
-SEARCH_DESCRIPTION = """
-Search the UniProt protein database using query syntax.
-
-Args:
-    query: UniProt query string. Examples:
-        - gene:BRCA1 - Search by gene name
-        - organism_id:9606 - Human proteins (NCBI taxonomy ID)
-        - (gene:BRCA*) AND (organism_id:10090) - Mouse BRCA genes with wildcard
-        - length:[500 TO 700] - Proteins of specific length range
-        - keyword:kinase - By UniProt keyword
-        - family:serpin - By protein family
-        - ec:3.2.1.23 - By enzyme classification
-        - database:pfam - With Pfam cross-references
-        - reviewed:true - Only Swiss-Prot reviewed entries
-        
-        Available query fields (see https://www.uniprot.org/help/query-fields):
-        - accession: Primary/canonical isoform accessions (e.g., accession:P62988)
-        - active: Active/obsolete status (e.g., active:false)
-        - lit_author: Reference author (e.g., lit_author:ashburner)
-        - protein_name: Protein name (e.g., protein_name:CD233)
-        - chebi: ChEBI identifier (e.g., chebi:18420)
-        - xrefcount_pdb: Cross-reference count (e.g., xref_count_pdb:[20 TO *])
-        - date_created: Creation date (e.g., date_created:[2012-10-01 TO *])
-        - date_modified: Last modification date (e.g., date_modified:[2012-01-01 TO 2019-03-01])
-        - date_sequence_modified: Sequence modification date (e.g., date_sequence_modified:[2012-01-01 TO 2012-03-01])
-        - database: Database cross-reference (e.g., database:pfam)
-        - xref: Cross-reference (e.g., xref:pdb-1aut)
-        - ec: Enzyme Commission number (e.g., ec:3.2.1.23)
-        - existence: Protein existence level (e.g., existence:3)
-        - family: Protein family (e.g., family:serpin)
-        - fragment: Fragment status (e.g., fragment:true)
-        - gene: Gene name (e.g., gene:HPSE)
-        - gene_exact: Exact gene name (e.g., gene_exact:HPSE)
-        - go: Gene Ontology term (e.g., go:0015629)
-        - virus_host_name: Virus host name
-        - virus_host_id: Virus host ID (e.g., virus_host_id:10090)
-        - accession_id: Primary accession (e.g., accession_id:P00750)
-        - inchikey: InChIKey identifier (e.g., inchikey:WQZGKKKJIJFFOK-GASJEMHNSA-N)
-        - interactor: Interacting protein (e.g., interactor:P00520)
-        - keyword: Keyword (e.g., keyword:toxin or keyword:KW-0800)
-        - length: Sequence length range (e.g., length:[500 TO 700])
-        - mass: Molecular mass range (e.g., mass:[500000 TO *])
-        - cc_mass_spectrometry: Mass spectrometry method (e.g., cc_mass_spectrometry:maldi)
-        - encoded_in: Gene location (e.g., encoded_in:Mitochondrion)
-        - organism_name: Organism name (e.g., organism_name:"Ovis aries")
-        - organism_id: Organism taxonomy ID (e.g., organism_id:9940)
-        - plasmid: Plasmid name (e.g., plasmid:ColE1)
-        - proteome: Proteome ID (e.g., proteome:UP000005640)
-        - proteomecomponent: Proteome component (e.g., proteomecomponent:"chromosome 1")
-        - sec_acc: Secondary accession (e.g., sec_acc:P02023)
-        - reviewed: Reviewed status (e.g., reviewed:true)
-        - scope: Reference scope (e.g., scope:mutagenesis)
-        - sequence: Sequence identifier (e.g., accession:P05067-9 AND is_isoform:true)
-        - strain: Organism strain (e.g., strain:wistar)
-        - taxonomy_name: Taxonomy name (e.g., taxonomy_name:mammal)
-        - taxonomy_id: Taxonomy ID (e.g., taxonomy_id:40674)
-        - tissue: Tissue type (e.g., tissue:liver)
-        - cc_webresource: Web resource (e.g., cc_webresource:wikipedia)
-        
-    database: UniProt database to search. One of: uniprotkb (default), uniparc, uniref
-    
-    limit: Maximum number of results per page (1-100, default 10)
-    
-    fields: Optional list of return fields to include. If not specified, all fields
-        are returned. Available return fields (see https://www.uniprot.org/help/return_fields):
-        
-        Names & Taxonomy:
-        - accession, id, gene_names, gene_primary, gene_synonym, gene_oln, gene_orf
-        - organism_name, organism_id, protein_name, xref_proteomes
-        - lineage, lineage_ids, virus_hosts
-        
-        Sequences:
-        - cc_alternative_products, ft_var_seq, cc_sc_epred, fragment, encoded_in
-        - length, mass, cc_mass_spectrometry, ft_variant, ft_non_cons, ft_non_std
-        - ft_non_ter, cc_polymorphism, cc_rna_editing, sequence, cc_sequence_caution
-        - ft_conflict, ft_unsure, sequence_version
-        
-        Function:
-        - absorption, ft_act_site, cc_activity_regulation, ft_binding, cc_catalytic_activity
-        - cc_cofactor, ft_dna_bind, ec, cc_function, kinetics, cc_pathway
-        - ph_dependence, redox_potential, rhea, ft_site, temp_dependence
-        
-        Miscellaneous:
-        - annotation_score, cc_caution, comment_count, feature_count, keywordid, keyword
-        - cc_miscellaneous, protein_existence, reviewed, tools, uniparc_id
-        
-        Interaction:
-        - cc_interaction, cc_subunit
-        
-        Expression:
-        - cc_developmental_stage, cc_induction, cc_tissue_specificity
-        
-        Gene Ontology (GO):
-        - go_p, go_c, go, go_f, go_id
-        
-        Pathology & Biotech:
-        - cc_allergen, cc_biotechnology, cc_disruption_phenotype, cc_disease
-        - ft_mutagen, cc_pharmaceutical, cc_toxic_dose
-        
-        Subcellular location:
-        - ft_intramem, cc_subcellular_location, ft_topo_dom, ft_transmem
-        
-        PTM / Processing:
-        - ft_chain, ft_crosslnk, ft_disulfid, ft_carbohyd, ft_init_met, ft_lipid
-        - ft_mod_res, ft_peptide, cc_ptm, ft_propep, ft_signal, ft_transit
-        
-        Structure:
-        - structure_3d, ft_strand, ft_helix, ft_turn
-        
-        Publications:
-        - lit_pubmed_id
-        
-        Date:
-        - date_created, date_modified, date_sequence_modified, version
-        
-        Family & Domains:
-        - ft_coiled, ft_compbias, cc_domain, ft_domain, ft_motif, protein_families
-        - ft_region, ft_repeat, ft_zn_fing
-        
-        Cross-references:
-        - See https://www.uniprot.org/help/return_fields for cross-reference fields
-        
-    cursor: Pagination cursor from a previous search result's 'nextCursor' field.
-        Pass this to retrieve the next page of results.
-    
-    response_format: Response format. One of: 'json' (default) or 'toon'.
-        - 'json': Returns response in JSON format
-        - 'toon': Returns response in TOON format
-
-Returns:
-    When response_format='json': JSON object with:
-    - results: Array of matching protein entries
-    - total: Total number of matching entries (if available)
-    - nextCursor: Cursor string for retrieving the next page (if more results exist)
-    
-    When response_format='toon': TOON-formatted string with:
-    - results: Array of matching protein entries
-    - total: Total number of matching entries (if available)
-    - nextCursor: Cursor string for retrieving the next page (if more results exist)
-
-See https://www.uniprot.org/help/query-fields for full query syntax documentation.
-"""
-
-
-FETCH_DESCRIPTION = """
-Fetch specific protein entries by their UniProt accession IDs.
+def _validate_format(response_format: str) -> None:
+    """
+    Validate the response format parameter shared by all tools.
 
-Args:
-    ids: List of UniProt accession IDs to fetch. Examples:
-        - ["P62988"] - Single protein
-        - ["A0A0C5B5G6", "A0A1B0GTW7"] - Multiple proteins
-        
-    database: UniProt database to fetch from. One of: uniprotkb (default), uniparc, uniref
-    
-    fields: Optional list of return fields to include. If not specified, all fields
-        are returned. Available return fields (see https://www.uniprot.org/help/return_fields):
-        
-        Names & Taxonomy:
-        - accession, id, gene_names, gene_primary, gene_synonym, gene_oln, gene_orf
-        - organism_name, organism_id, protein_name, xref_proteomes
-        - lineage, lineage_ids, virus_hosts
-        
-        Sequences:
-        - cc_alternative_products, ft_var_seq, cc_sc_epred, fragment, encoded_in
-        - length, mass, cc_mass_spectrometry, ft_variant, ft_non_cons, ft_non_std
-        - ft_non_ter, cc_polymorphism, cc_rna_editing, sequence, cc_sequence_caution
-        - ft_conflict, ft_unsure, sequence_version
-        
-        Function:
-        - absorption, ft_act_site, cc_activity_regulation, ft_binding, cc_catalytic_activity
-        - cc_cofactor, ft_dna_bind, ec, cc_function, kinetics, cc_pathway
-        - ph_dependence, redox_potential, rhea, ft_site, temp_dependence
-        
-        Miscellaneous:
-        - annotation_score, cc_caution, comment_count, feature_count, keywordid, keyword
-        - cc_miscellaneous, protein_existence, reviewed, tools, uniparc_id
-        
-        Interaction:
-        - cc_interaction, cc_subunit
-        
-        Expression:
-        - cc_developmental_stage, cc_induction, cc_tissue_specificity
-        
-        Gene Ontology (GO):
-        - go_p, go_c, go, go_f, go_id
-        
-        Pathology & Biotech:
-        - cc_allergen, cc_biotechnology, cc_disruption_phenotype, cc_disease
-        - ft_mutagen, cc_pharmaceutical, cc_toxic_dose
-        
-        Subcellular location:
-        - ft_intramem, cc_subcellular_location, ft_topo_dom, ft_transmem
-        
-        PTM / Processing:
-        - ft_chain, ft_crosslnk, ft_disulfid, ft_carbohyd, ft_init_met, ft_lipid
-        - ft_mod_res, ft_peptide, cc_ptm, ft_propep, ft_signal, ft_transit
-        
-        Structure:
-        - structure_3d, ft_strand, ft_helix, ft_turn
-        
-        Publications:
-        - lit_pubmed_id
-        
-        Date:
-        - date_created, date_modified, date_sequence_modified, version
-        
-        Family & Domains:
-        - ft_coiled, ft_compbias, cc_domain, ft_domain, ft_motif, protein_families
-        - ft_region, ft_repeat, ft_zn_fing
-        
-        Cross-references:
-        - See https://www.uniprot.org/help/return_fields for cross-reference fields
-    
-    response_format: Response format. One of: 'json' (default) or 'toon'.
-        - 'json': Returns response in JSON format
-        - 'toon': Returns response in TOON format
-
-Returns:
-    When response_format='json': JSON object with:
-    - results: Array of fetched protein entries
-    - found: Number of entries successfully retrieved
-    - requested: Number of IDs that were requested
-    
-    When response_format='toon': TOON-formatted string with:
-    - results: Array of fetched protein entries
-    - found: Number of entries successfully retrieved
-    - requested: Number of IDs that were requested
-"""
+    Raises:
+        ValueError: If the format is not 'toon' or 'json'.
+    """
+    if response_format not in _VALID_FORMATS:
+        raise ValueError("Format must be 'toon' or 'json'")
 
 
 def _uniprot_search_impl(
@@ -296,14 +101,13 @@ def _uniprot_search_impl(
     # Validate inputs
     db = validate_database(database)
 
-    if not query or not query.strip():
+    if not (query and query.strip()):
         raise ValueError("Query string cannot be empty")
 
     if limit < 1 or limit > 100:
         raise ValueError("Limit must be between 1 and 100")
     
-    if response_format not in ("toon", "json"):
-        raise ValueError("Format must be 'toon' or 'json'")
+    _validate_format(response_format)
 
     # Decode cursor to get offset
     offset = 0
@@ -313,33 +117,64 @@ def _uniprot_search_impl(
     # Get the appropriate client
     client = get_client(db)
 
-    # Build search parameters
-    search_kwargs: dict[str, Any] = {"query": query}
+    # Execute search and collect the requested page of results
     if fields:
-        search_kwargs["fields"] = fields
+        search_result = client.search(query=query, fields=fields)
+    else:
+        search_result = client.search(query=query)
+    record_iterator = search_result.each_record()
+    # The page is materialised as a list because paginate_results needs its
+    # length and toon_format cannot encode iterators. Records are freshly
+    # parsed JSON dicts, so only copy other mappings
+    results: list[dict[str, Any]] = [
+        record if type(record) is dict else dict(record)
+        for record in islice(record_iterator, offset, offset + limit)
+    ]
 
-    # Execute search and collect results
-    results: list[dict[str, Any]] = []
-    search_result = client.search(**search_kwargs)
+    result = paginate_results(results, offset, limit)
+    return _toon_encode(result) if response_format == "toon" else result
 
-    # Skip to offset and collect up to limit results
-    record_iterator = search_result.each_record()
 
-    # Skip to offset
-    for _ in range(offset):
-        try:
-            next(record_iterator)
-        except StopIteration:
-            break
+def _fetch_chunk(
+    client: Any, ids: list[str], fields: list[str] | None
+) -> list[dict[str, Any]]:
+    """
+    Fetch a single batch of entries by accession.
 
-    # Collect results up to limit
-    for record in record_iterator:
-        results.append(dict(record))
-        if len(results) >= limit:
-            break
+    Args:
+        client: The unipressed client class to query.
+        ids: The cleaned accession IDs to fetch.
+        fields: Optional list of return fields to include.
 
-    result = paginate_results(results, offset, limit)
-    return _format_response(result, response_format)
+    Returns:
+        The entries that were found; missing IDs are simply absent.
+
+    Raises:
+        requests.RequestException: If UniProt could not be reached or
+            returned an error other than 400/404.
+    """
+    try:
+        # If fields are specified, use search with accession queries since
+        # fetch_many doesn't support field selection
+        if fields:
+            # Build query for multiple accessions: accession:(P12345 OR P67890)
+            if len(ids) == 1:
+                query = f"accession:{ids[0]}"
+            else:
+                query = f"accession:({' OR '.join(ids)})"
+            search_result = client.search(query=query, fields=fields)
+            records = islice(search_result.each_record(), len(ids))
+        else:
+            # Use fetch_many when no field selection is needed; every supported
+            # client implements it, including for a single ID
+            records = client.fetch_many(ids)
+        return [record if type(record) is dict else dict(record) for record in records]
+    except requests.HTTPError as e:
+        # UniProt answers 400/404 for IDs it cannot find; other failures
+        # (outages, timeouts, 5xx) propagate so they are never cached
+        if e.response is not None and e.response.status_code in _NOT_FOUND_STATUSES:
+            return []  # IDs not found, will be reflected in found count
+        raise
 
 
 def _uniprot_fetch_impl(
@@ -357,70 +192,111 @@ def _uniprot_fetch_impl(
     # Validate inputs
     db = validate_database(database)
     
-    if response_format not in ("toon", "json"):
-        raise ValueError("Format must be 'toon' or 'json'")
+    _validate_format(response_format)
 
     if not ids:
         raise ValueError("IDs list cannot be empty")
 
     # Clean and validate IDs
-    clean_ids = [id_.strip() for id_ in ids if id_ and id_.strip()]
+    clean_ids = [s for id_ in ids if id_ and (s := id_.strip())]
     if not clean_ids:
         raise ValueError("No valid IDs provided")
 
     # Get the appropriate client
     client = get_client(db)
 
-    # Fetch entries
-    results: list[dict[str, Any]] = []
-
-    # If fields are specified, use search with accession queries since
-    # fetch_one/fetch_many don't support field selection
-    if fields:
-        # Build query for multiple accessions: accession:(P12345 OR P67890)
-        if len(clean_ids) == 1:
-            query = f"accession:{clean_ids[0]}"
+    # Malformed IDs are reported as invalid and never sent to UniProt
+    lookup_ids = []
+    invalid_ids = []
+    for id_ in clean_ids:
+        if (normalised := normalise_id(db, id_)) is None:
+            invalid_ids.append(id_)
         else:
-            accession_list = " OR ".join(clean_ids)
-            query = f"accession:({accession_list})"
-        
-        try:
-            search_result = client.search(query=query, fields=fields)
-            for record in search_result.each_record():
-                results.append(dict(record))
-                if len(results) >= len(clean_ids):
-                    break
-        except Exception:
-            pass  # IDs not found, will be reflected in found count
+            lookup_ids.append(normalised)
+
+    # Fetch entries, spreading large ID lists over concurrent requests
+    chunks = [
+        lookup_ids[i : i + _FETCH_CHUNK_SIZE]
+        for i in range(0, len(lookup_ids), _FETCH_CHUNK_SIZE)
+    ]
+    if not chunks:
+        results = []
+    elif len(chunks) == 1:
+        results = _fetch_chunk(client, chunks[0], fields)
     else:
-        # Use fetch methods when no field selection is needed
-        if len(clean_ids) == 1:
-            # Single ID fetch
-            try:
-                record = client.fetch_one(clean_ids[0])
-                if record:
-                    results.append(dict(record))
-            except Exception:
-                pass  # ID not found, will be reflected in found count
-        else:
-            # Multiple IDs fetch
-            try:
-                records = client.fetch_many(clean_ids)
-                for record in records:
-                    results.append(dict(record))
-            except Exception:
-                pass  # Some IDs may not be found
+        workers = min(_FETCH_MAX_WORKERS, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = [
+                record
+                for chunk_results in pool.map(
+                    lambda chunk: _fetch_chunk(client, chunk, fields), chunks
+                )
+                for record in chunk_results
+            ]
 
     result = {
         "results": results,
         "found": len(results),
         "requested": len(clean_ids),
+        "invalid": invalid_ids,
     }
-    return _format_response(result, response_format)
+    return _toon_encode(result) if response_format == "toon" else result
+
+
+def _response_size(response: dict[str, Any] | str) -> int:
+    """Approximate a cached response's size by its serialised length."""
+    return len(response) if isinstance(response, str) else len(json.dumps(response))
+
+
+def _response_cache() -> TTLCache:
+    """Build a size-bounded response cache; oversized responses are not stored."""
+    return TTLCache(
+        maxsize=_RESPONSE_CACHE_MAX_CHARS,
+        ttl=_RESPONSE_CACHE_TTL,
+        getsizeof=_response_size,
+    )
+
+
+@cached(_response_cache(), lock=Lock())
+def _cached_search(
+    query: str,
+    database: str,
+    limit: int,
+    fields: tuple[str, ...] | None,
+    cursor: str | None,
+    response_format: str,
+) -> dict[str, Any] | str:
+    """
+    Memoised search; fields are passed as a tuple so the call is hashable.
+
+    Cache hits return the stored response object itself, so callers must not
+    mutate it. Exceptions are not cached.
+    """
+    return _uniprot_search_impl(
+        query, database, limit, list(fields) if fields else None, cursor, response_format
+    )
+
+
+@cached(_response_cache(), lock=Lock())
+def _cached_fetch(
+    ids: tuple[str, ...],
+    database: str,
+    fields: tuple[str, ...] | None,
+    response_format: str,
+) -> dict[str, Any] | str:
+    """
+    Memoised fetch; list arguments are passed as tuples so the call is hashable.
+
+    Cache hits return the stored response object itself, so callers must not
+    mutate it. Exceptions, including failed requests to UniProt, are not cached.
+    """
+    return _uniprot_fetch_impl(
+        list(ids), database, list(fields) if fields else None, response_format
+    )
 
 
 # Register tools with FastMCP
-@mcp.tool(description=SEARCH_DESCRIPTION)
+@mcp.tool(description=_load_description("search"))
 def uniprot_search(
     query: str,
     database: str = "uniprotkb",
@@ -430,10 +306,18 @@ def uniprot_search(
     response_format: Literal["toon", "json"] = "json",
 ) -> dict[str, Any] | str:
     """Search the UniProt protein database."""
-    return _uniprot_search_impl(query, database, limit, fields, cursor, response_format)
-
-
-@mcp.tool(description=FETCH_DESCRIPTION)
+    # Normalise arguments that don't change the response so they share a cache entry
+    return _cached_search(
+        query,
+        database.lower(),
+        limit,
+        tuple(sorted(fields)) if fields else None,
+        cursor,
+        response_format,
+    )
+
+
+@mcp.tool(description=_load_description("fetch"))
 def uniprot_fetch(
     ids: list[str],
     database: str = "uniprotkb",
@@ -441,7 +325,13 @@ def uniprot_fetch(
     response_format: Literal["toon", "json"] = "json",
 ) -> dict[str, Any] | str:
     """Fetch specific protein entries by their UniProt accession IDs."""
-    return _uniprot_fetch_impl(ids, database, fields, response_format)
+    # Normalise arguments that don't change the response so they share a cache entry
+    return _cached_fetch(
+        tuple(ids),
+        database.lower(),
+        tuple(sorted(fields)) if fields else None,
+        response_format,
+    )
 
 
 def main():
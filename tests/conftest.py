@@ -0,0 +1,82 @@
+"""Shared pytest fixtures for UniProt MCP Server tests."""
+
+import os
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from unipressed.dataset import core as unipressed_core
+from unipressed.dataset import search as unipressed_search
+
+
+class _SharedSessionRequests:
+    """
+    Stand-in for the requests module that routes unipressed through one session.
+
+    unipressed has no hook for supplying a session, so this replaces the
+    ``requests`` global in its private ``unipressed.dataset.core`` and
+    ``unipressed.dataset.search`` modules. Revisit it if unipressed changes
+    how those modules import requests.
+    """
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def get(self, *args, **kwargs) -> requests.Response:
+        return self._session.get(*args, **kwargs)
+
+    def Session(self) -> requests.Session:
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(requests, name)
+
+
+def _make_session(cache_dir) -> requests.Session:
+    """
+    Build the HTTP session used for integration tests.
+
+    Uses a requests-cache CachedSession when available so fetch responses are
+    cached on disk across runs. Search endpoints are never cached: unipressed
+    reads their gzip-compressed pages from the raw response stream, which
+    cached responses cannot replay.
+    """
+    try:
+        import requests_cache
+    except ImportError:
+        return requests.Session()
+    return requests_cache.CachedSession(
+        str(cache_dir / "responses"),
+        backend="sqlite",
+        expire_after=86400,
+        urls_expire_after={"*/search": requests_cache.DO_NOT_CACHE},
+        cache_control=True,
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def uniprot_http_session(request):
+    """
+    Share one pooled (and, if possible, caching) HTTP session across the
+    integration test session.
+
+    Fetch requests reuse pooled connections to UniProt. unipressed sends
+    searches with stream=True and the server reads only part of each page,
+    so search connections are not released back to the pool.
+
+    Only active when integration tests are enabled.
+    """
+    if not os.getenv("RUN_INTEGRATION_TESTS"):
+        yield None
+        return
+
+    session = _make_session(request.config.cache.mkdir("uniprot_http"))
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    shared = _SharedSessionRequests(session)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(unipressed_core, "requests", shared)
+        mp.setattr(unipressed_search, "requests", shared)
+        try:
+            yield session
+        finally:
+            session.close()
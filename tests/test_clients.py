@@ -4,7 +4,13 @@ import pytest
 
 from unipressed import UniprotkbClient, UniparcClient, UnirefClient
 
-from uniprot_mcp.clients import get_client, validate_database, VALID_DATABASES
+from uniprot_mcp.clients import (
+    ID_PATTERNS,
+    get_client,
+    normalise_id,
+    validate_database,
+    VALID_DATABASES,
+)
 
 
 class TestGetClient:
@@ -51,6 +57,11 @@ class TestValidateDatabase:
         with pytest.raises(ValueError, match="Invalid database"):
             validate_database("notadb")
 
+    def test_error_lists_databases_in_sorted_order(self):
+        """Error message should list valid databases deterministically."""
+        with pytest.raises(ValueError, match="one of: uniparc, uniprotkb, uniref$"):
+            validate_database("notadb")
+
 
 class TestValidDatabases:
     """Tests for VALID_DATABASES constant."""
@@ -62,3 +73,52 @@ class TestValidDatabases:
         assert "uniref" in VALID_DATABASES
         assert len(VALID_DATABASES) == 3
 
+
+class TestIdPatterns:
+    """Tests for the per-database ID_PATTERNS."""
+
+    def test_covers_every_database(self):
+        """Every supported database should have an ID pattern."""
+        assert set(ID_PATTERNS) == VALID_DATABASES
+
+    @pytest.mark.parametrize(
+        "database,id_,valid",
+        [
+            pytest.param("uniprotkb", "P62988", True, id="kb-6"),
+            pytest.param("uniprotkb", "A0A0C5B5G6", True, id="kb-10"),
+            pytest.param("uniprotkb", "P05067-9", True, id="kb-isoform"),
+            pytest.param("uniprotkb", "NOTREAL123", False, id="kb-malformed"),
+            pytest.param("uniprotkb", "p62988", False, id="kb-lowercase-unnormalised"),
+            pytest.param("uniprotkb", "P62988 OR x", False, id="kb-query"),
+            pytest.param("uniparc", "UPI0000000001", True, id="parc"),
+            pytest.param("uniparc", "UPI00000000", False, id="parc-short"),
+            pytest.param("uniparc", "P62988", False, id="parc-accession"),
+            pytest.param("uniref", "UniRef90_P62988", True, id="ref-kb"),
+            pytest.param("uniref", "UniRef100_A0A0C5B5G6-2", True, id="ref-isoform"),
+            pytest.param("uniref", "UniRef50_UPI0000000001", True, id="ref-parc"),
+            pytest.param("uniref", "UniRef80_P62988", False, id="ref-identity"),
+            pytest.param("uniref", "P62988", False, id="ref-bare"),
+        ],
+    )
+    def test_id_shapes(self, database, id_, valid):
+        """IDs should match only their own database's format."""
+        assert bool(ID_PATTERNS[database].fullmatch(id_)) is valid
+
+    @pytest.mark.parametrize(
+        "database,id_,expected",
+        [
+            pytest.param("uniprotkb", "p62988", "P62988", id="kb-lowercase"),
+            pytest.param("uniprotkb", "p05067-9", "P05067-9", id="kb-isoform"),
+            pytest.param("uniparc", "upi0000000001", "UPI0000000001", id="parc"),
+            pytest.param("uniref", "uniref90_p62988", "UniRef90_P62988", id="ref-kb"),
+            pytest.param(
+                "uniref", "UNIREF50_upi00000000ab", "UniRef50_UPI00000000AB", id="ref-parc"
+            ),
+            pytest.param("uniprotkb", "NOTREAL123", None, id="kb-malformed"),
+            pytest.param("uniref", "uniref80_p62988", None, id="ref-identity"),
+            pytest.param("uniref", "p62988", None, id="ref-bare"),
+        ],
+    )
+    def test_normalise_id(self, database, id_, expected):
+        """IDs should be normalised to canonical case or rejected."""
+        assert normalise_id(database, id_) == expected
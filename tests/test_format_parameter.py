@@ -1,12 +1,14 @@
 """Tests to verify the response_format parameter works correctly."""
 
+import inspect
+
 import pytest
 
+from uniprot_mcp.server import _uniprot_fetch_impl, _uniprot_search_impl
+
 
 def test_response_format_parameter_validation():
     """Test that invalid response_format values are rejected."""
-    from uniprot_mcp.server import _uniprot_search_impl, _uniprot_fetch_impl
-    
     # Should raise ValueError for invalid format
     with pytest.raises(ValueError, match="Format must be"):
         _uniprot_search_impl(query="gene:BRCA1", response_format="invalid_format")
@@ -17,9 +19,6 @@ def test_response_format_parameter_validation():
 
 def test_response_format_parameter_in_implementation():
     """Test that response_format parameter exists in implementation functions."""
-    import inspect
-    from uniprot_mcp.server import _uniprot_search_impl, _uniprot_fetch_impl
-    
     # Check _uniprot_search_impl
     sig_search = inspect.signature(_uniprot_search_impl)
     assert "response_format" in sig_search.parameters, "response_format parameter missing from _uniprot_search_impl"
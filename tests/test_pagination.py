@@ -1,5 +1,7 @@
 """Tests for pagination utilities."""
 
+import base64
+
 import pytest
 
 from uniprot_mcp.pagination import decode_cursor, encode_cursor, paginate_results
@@ -26,28 +28,29 @@ class TestCursorEncoding:
         with pytest.raises(ValueError, match="Invalid cursor"):
             decode_cursor("not-a-valid-cursor!!!")
 
-    def test_decode_wrong_json_structure_raises(self):
-        """Decoding a cursor without 'offset' field should raise."""
-        import base64
-        import json
-
-        bad_cursor = base64.urlsafe_b64encode(
-            json.dumps({"wrong": "field"}).encode()
-        ).decode()
-        with pytest.raises(ValueError, match="missing 'offset'"):
+    def test_decode_wrong_width_raises(self):
+        """Decoding a cursor that is not a fixed-width integer should raise."""
+        bad_cursor = base64.urlsafe_b64encode(b"\x00\x01\x02").decode()
+        with pytest.raises(ValueError, match="Invalid cursor"):
             decode_cursor(bad_cursor)
 
     def test_decode_negative_offset_raises(self):
         """Decoding a cursor with negative offset should raise."""
-        import base64
-        import json
-
         bad_cursor = base64.urlsafe_b64encode(
-            json.dumps({"offset": -5}).encode()
+            (-5).to_bytes(8, "big", signed=True)
         ).decode()
         with pytest.raises(ValueError, match="Invalid offset"):
             decode_cursor(bad_cursor)
 
+    def test_encode_is_fixed_width(self):
+        """Cursors should have the same length regardless of offset."""
+        assert len(encode_cursor(0)) == len(encode_cursor(10**12))
+
+    def test_cached_and_uncached_encodings_roundtrip(self):
+        """Offsets on either side of the cursor cache boundary should roundtrip."""
+        for offset in [4094, 4095, 4096, 4097]:
+            assert decode_cursor(encode_cursor(offset)) == offset
+
 
 class TestPaginateResults:
     """Tests for paginate_results function."""
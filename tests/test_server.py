@@ -1,11 +1,23 @@
 """Tests for MCP server tools."""
 
 import os
+import re
 from typing import Any
 
 import pytest
+import requests
 
-from uniprot_mcp.server import _uniprot_search_impl, _uniprot_fetch_impl
+from uniprot_mcp import server
+from uniprot_mcp.pagination import encode_cursor
+from uniprot_mcp.server import (
+    _cached_fetch,
+    _cached_search,
+    _load_description,
+    _uniprot_fetch_impl,
+    _uniprot_search_impl,
+    uniprot_fetch,
+    uniprot_search,
+)
 
 # Skip integration tests unless RUN_INTEGRATION_TESTS environment variable is set
 skip_integration = pytest.mark.skipif(
@@ -14,129 +26,423 @@ skip_integration = pytest.mark.skipif(
 )
 
 
-class TestUniprotSearchValidation:
-    """Tests for uniprot_search input validation."""
-
-    def test_empty_query_raises(self):
-        """Empty query should raise ValueError."""
-        with pytest.raises(ValueError, match="cannot be empty"):
-            _uniprot_search_impl(query="")
-
-    def test_whitespace_query_raises(self):
-        """Whitespace-only query should raise ValueError."""
-        with pytest.raises(ValueError, match="cannot be empty"):
-            _uniprot_search_impl(query="   ")
-
-    def test_invalid_database_raises(self):
-        """Invalid database should raise ValueError."""
-        with pytest.raises(ValueError, match="Invalid database"):
-            _uniprot_search_impl(query="gene:BRCA1", database="invalid")
-
-    def test_limit_too_low_raises(self):
-        """Limit below 1 should raise ValueError."""
-        with pytest.raises(ValueError, match="between 1 and 100"):
-            _uniprot_search_impl(query="gene:BRCA1", limit=0)
-
-    def test_limit_too_high_raises(self):
-        """Limit above 100 should raise ValueError."""
-        with pytest.raises(ValueError, match="between 1 and 100"):
-            _uniprot_search_impl(query="gene:BRCA1", limit=101)
-
-    def test_invalid_cursor_raises(self):
-        """Invalid cursor should raise ValueError."""
-        with pytest.raises(ValueError, match="Invalid cursor"):
-            _uniprot_search_impl(query="gene:BRCA1", cursor="bad-cursor!!!")
-    
-    def test_invalid_format_raises(self):
-        """Invalid format should raise ValueError."""
-        with pytest.raises(ValueError, match="Format must be"):
-            _uniprot_search_impl(query="gene:BRCA1", response_format="invalid")
-
-
-class TestUniprotFetchValidation:
-    """Tests for uniprot_fetch input validation."""
-
-    def test_empty_ids_raises(self):
-        """Empty IDs list should raise ValueError."""
-        with pytest.raises(ValueError, match="cannot be empty"):
-            _uniprot_fetch_impl(ids=[])
-
-    def test_whitespace_only_ids_raises(self):
-        """List with only whitespace IDs should raise ValueError."""
-        with pytest.raises(ValueError, match="No valid IDs"):
-            _uniprot_fetch_impl(ids=["", "   "])
-
-    def test_invalid_database_raises(self):
-        """Invalid database should raise ValueError."""
-        with pytest.raises(ValueError, match="Invalid database"):
-            _uniprot_fetch_impl(ids=["P62988"], database="invalid")
-    
-    def test_invalid_format_raises(self):
-        """Invalid format should raise ValueError."""
-        with pytest.raises(ValueError, match="Format must be"):
-            _uniprot_fetch_impl(ids=["P62988"], response_format="invalid")
+class _FakeSearch:
+    """Stand-in for a unipressed search yielding numbered records."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def each_record(self):
+        return iter({"id": i} for i in range(self.count))
+
+
+def _echo_records(ids: list[str]) -> list[dict[str, Any]]:
+    return [{"primaryAccession": id_} for id_ in ids]
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """
+    Install a fake unipressed client in place of get_client.
+
+    Returns a function taking optional ``fetch_many(ids)`` and
+    ``search(**kwargs)`` behaviours and returning the list of recorded calls:
+    the ID list for each fetch_many call, the keyword arguments for each search.
+    By default fetch_many echoes one record per ID and search yields 25 records.
+    """
+
+    def install(fetch_many=_echo_records, search=lambda **kwargs: _FakeSearch(25)):
+        calls: list[Any] = []
+
+        class FakeClient:
+            @staticmethod
+            def fetch_many(ids: list[str]) -> list[dict[str, Any]]:
+                calls.append(ids)
+                return fetch_many(ids)
+
+            @staticmethod
+            def search(**kwargs: Any) -> _FakeSearch:
+                calls.append(kwargs)
+                return search(**kwargs)
+
+        monkeypatch.setattr("uniprot_mcp.server.get_client", lambda db: FakeClient)
+        return calls
+
+    return install
+
+
+class TestToolDescriptions:
+    """Tests for the packaged tool descriptions."""
+
+    def test_descriptions_load(self):
+        """Both tool descriptions should load from package resources."""
+        assert _load_description("search").startswith("Search the UniProt")
+        assert _load_description("fetch").startswith("Fetch specific protein")
+
+
+# Compiled once and shared by the parametrized rows below
+_MSGS = {
+    key: re.compile(pattern)
+    for key, pattern in {
+        "empty": "cannot be empty",
+        "db": "Invalid database",
+        "range": "between 1 and 100",
+        "cursor": "Invalid cursor",
+        "fmt": "Format must be",
+        "novalid": "No valid IDs",
+    }.items()
+}
+
+SEARCH_BAD = [
+    pytest.param({"query": ""}, _MSGS["empty"], id="empty-query"),
+    pytest.param({"query": "   "}, _MSGS["empty"], id="whitespace-query"),
+    pytest.param({"query": "gene:BRCA1", "database": "invalid"}, _MSGS["db"], id="database"),
+    pytest.param({"query": "gene:BRCA1", "limit": 0}, _MSGS["range"], id="limit-low"),
+    pytest.param({"query": "gene:BRCA1", "limit": 101}, _MSGS["range"], id="limit-high"),
+    pytest.param(
+        {"query": "gene:BRCA1", "cursor": "bad-cursor!!!"}, _MSGS["cursor"], id="cursor"
+    ),
+    pytest.param(
+        {"query": "gene:BRCA1", "response_format": "invalid"}, _MSGS["fmt"], id="format"
+    ),
+]
+
+FETCH_BAD = [
+    pytest.param({"ids": []}, _MSGS["empty"], id="empty-ids"),
+    pytest.param({"ids": ["", "   "]}, _MSGS["novalid"], id="whitespace-ids"),
+    pytest.param({"ids": ["P62988"], "database": "invalid"}, _MSGS["db"], id="database"),
+    pytest.param(
+        {"ids": ["P62988"], "response_format": "invalid"}, _MSGS["fmt"], id="format"
+    ),
+]
+
+
+@pytest.mark.parametrize("kwargs,msg", SEARCH_BAD)
+def test_search_rejects(kwargs: dict[str, Any], msg: re.Pattern[str]):
+    """Invalid search arguments should raise ValueError."""
+    with pytest.raises(ValueError, match=msg):
+        _uniprot_search_impl(**kwargs)
+
+
+@pytest.mark.parametrize("kwargs,msg", FETCH_BAD)
+def test_fetch_rejects(kwargs: dict[str, Any], msg: re.Pattern[str]):
+    """Invalid fetch arguments should raise ValueError."""
+    with pytest.raises(ValueError, match=msg):
+        _uniprot_fetch_impl(**kwargs)
+
+
+class TestUniprotFetchInputs:
+    """Tests for uniprot_fetch ID handling (no network)."""
+
+    def test_ids_are_stripped(self, fake_client):
+        """Surrounding whitespace should be removed and blank IDs dropped."""
+        calls = fake_client(fetch_many=lambda ids: [])
+        result = _uniprot_fetch_impl(ids=[" P62988 ", "", "  ", "Q9Y6K9\n"])
+        assert calls == [["P62988", "Q9Y6K9"]]
+        assert result["requested"] == 2
+
+    def test_fields_fetch_is_bounded_by_id_count(self, fake_client):
+        """Field-selected fetches should return at most one record per ID."""
+        calls = fake_client(search=lambda **kwargs: _FakeSearch(5))
+        result = _uniprot_fetch_impl(ids=["P62988", "Q9Y6K9"], fields=["accession"])
+        assert calls == [
+            {"query": "accession:(P62988 OR Q9Y6K9)", "fields": ["accession"]}
+        ]
+        assert result["found"] == 2
+
+    def test_single_id_uses_fetch_many(self, fake_client):
+        """A single ID should go through the same fetch_many path."""
+        fake_client()
+        result = _uniprot_fetch_impl(ids=["P62988"])
+        assert result["results"] == [{"primaryAccession": "P62988"}]
+        assert result["found"] == 1
+
+    def test_large_id_lists_are_chunked(self, fake_client):
+        """Large ID lists should be split into batches and reassembled in order."""
+        calls = fake_client()
+        ids = [f"P{i:05d}" for i in range(120)]
+        result = _uniprot_fetch_impl(ids=ids)
+        assert sorted(len(batch) for batch in calls) == [20, 50, 50]
+        assert [r["primaryAccession"] for r in result["results"]] == ids
+        assert result["found"] == 120
+
+    def test_failed_batch_only_drops_its_own_ids(self, fake_client):
+        """A batch UniProt rejects should not lose the other batches' records."""
+        ids = [f"P{i:05d}" for i in range(120)]
+        rejected = ids[50:100]
+
+        def fetch_many(batch: list[str]) -> list[dict[str, Any]]:
+            if batch == rejected:
+                raise _http_error(400)
+            return _echo_records(batch)
+
+        calls = fake_client(fetch_many=fetch_many)
+        result = _uniprot_fetch_impl(ids=ids)
+        assert len(calls) == 3
+        assert [r["primaryAccession"] for r in result["results"]] == (
+            ids[:50] + ids[100:]
+        )
+        assert result["found"] == 70
+        assert result["requested"] == 120
+
+    def test_malformed_ids_skip_the_network(self, fake_client):
+        """IDs that cannot be accessions should be reported as invalid."""
+        calls = fake_client()
+        result = _uniprot_fetch_impl(
+            ids=["P62988", "P05067-9", "NOTREAL123", "P1 OR x:y", "UniRef90_P62988"]
+        )
+        assert calls == [["P62988", "P05067-9"]]
+        assert result["found"] == 2
+        assert result["requested"] == 5
+        assert result["invalid"] == ["NOTREAL123", "P1 OR x:y", "UniRef90_P62988"]
+
+        calls.clear()
+        result = _uniprot_fetch_impl(ids=["gene:BRCA1"])
+        assert calls == []
+        assert result["found"] == 0
+        assert result["invalid"] == ["gene:BRCA1"]
+
+    def test_lowercase_ids_are_normalised(self, fake_client):
+        """Lowercase IDs should be upper-cased and sent rather than rejected."""
+        calls = fake_client()
+        result = _uniprot_fetch_impl(ids=["p62988", "q9y6k9"])
+        assert calls == [["P62988", "Q9Y6K9"]]
+        assert result["found"] == 2
+        assert result["invalid"] == []
+
+        calls.clear()
+        result = _uniprot_fetch_impl(ids=["uniref90_p62988"], database="uniref")
+        assert calls == [["UniRef90_P62988"]]
+        assert result["invalid"] == []
+
+
+class TestUniprotSearchPaging:
+    """Tests for offset/limit handling in uniprot_search (no network)."""
+
+    def test_cursor_skips_to_offset(self, fake_client):
+        """Following nextCursor should return the next slice of records."""
+        fake_client()
+        first = _uniprot_search_impl(query="gene:BRCA1", limit=10)
+        assert [r["id"] for r in first["results"]] == list(range(10))
+        second = _uniprot_search_impl(
+            query="gene:BRCA1", limit=10, cursor=first["nextCursor"]
+        )
+        assert [r["id"] for r in second["results"]] == list(range(10, 20))
+
+    def test_last_page_is_partial(self, fake_client):
+        """The final page should be short and carry no nextCursor."""
+        fake_client()
+        result = _uniprot_search_impl(
+            query="gene:BRCA1", limit=10, cursor=encode_cursor(20)
+        )
+        assert [r["id"] for r in result["results"]] == list(range(20, 25))
+        assert "nextCursor" not in result
+
+    def test_toon_format_returns_string(self, fake_client):
+        """TOON responses should be encoded strings rather than dicts."""
+        fake_client()
+        result = _uniprot_search_impl(
+            query="gene:BRCA1", limit=2, response_format="toon"
+        )
+        assert isinstance(result, str)
+        assert "nextCursor" in result
+
+
+class TestResponseCache:
+    """Tests for memoisation of tool responses (no network)."""
+
+    @pytest.fixture(autouse=True)
+    def clear_caches(self):
+        _cached_search.cache_clear()
+        _cached_fetch.cache_clear()
+        yield
+        _cached_search.cache_clear()
+        _cached_fetch.cache_clear()
+
+    def test_repeated_search_hits_cache(self, fake_client):
+        """Identical searches should only reach the client once."""
+        calls = fake_client(search=lambda **kwargs: _FakeSearch(3))
+        args = ("gene:BRCA1", "uniprotkb", 10, ("accession",), None, "json")
+        first = _cached_search(*args)
+        second = _cached_search(*args)
+        assert first is second
+        assert calls == [{"query": "gene:BRCA1", "fields": ["accession"]}]
+
+    def test_equivalent_arguments_share_an_entry(self, fake_client):
+        """Field order and database case should not create separate entries."""
+        calls = fake_client(search=lambda **kwargs: _FakeSearch(3))
+        first = uniprot_search.fn(
+            "gene:BRCA1", database="UniProtKB", fields=["gene_names", "accession"]
+        )
+        second = uniprot_search.fn(
+            "gene:BRCA1", database="uniprotkb", fields=["accession", "gene_names"]
+        )
+        assert first is second
+        assert len(calls) == 1
+
+        calls.clear()
+        uniprot_fetch.fn(["P62988"], database="UniProtKB")
+        uniprot_fetch.fn(["P62988"], database="uniprotkb")
+        assert len(calls) == 1
+
+    def test_cache_is_bounded_by_response_size(self, monkeypatch):
+        """The cache should evict by serialised size, not entry count."""
+        monkeypatch.setattr(server, "_RESPONSE_CACHE_MAX_CHARS", 100)
+        cache = server._response_cache()
+        cache["first"] = "x" * 60
+        cache["second"] = {"results": ["y" * 40]}
+        assert "first" not in cache
+        assert "second" in cache
+        with pytest.raises(ValueError, match="too large"):
+            cache["huge"] = "z" * 101
+
+    def test_errors_are_not_cached(self):
+        """Validation errors should be raised on every call."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="cannot be empty"):
+                _cached_search("", "uniprotkb", 10, None, None, "json")
+
+    def test_repeated_fetch_hits_cache(self, fake_client):
+        """Identical fetches should only reach the client once."""
+        calls = fake_client()
+        _cached_fetch(("P62988",), "uniprotkb", None, "json")
+        _cached_fetch(("P62988",), "uniprotkb", None, "json")
+        assert calls == [["P62988"]]
+
+    def test_outage_is_not_cached(self, fake_client):
+        """Failed requests should raise on every call rather than cache 'not found'."""
+
+        def unreachable(ids: list[str]) -> list[dict[str, Any]]:
+            raise requests.ConnectionError("UniProt unreachable")
+
+        calls = fake_client(fetch_many=unreachable)
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                _cached_fetch(("P62988",), "uniprotkb", None, "json")
+        assert calls == [["P62988"], ["P62988"]]
+
+    @pytest.mark.parametrize("status", [400, 404])
+    def test_not_found_statuses_report_missing(self, fake_client, status):
+        """UniProt's not-found statuses should become an empty result."""
+
+        def not_found(ids: list[str]) -> list[dict[str, Any]]:
+            raise _http_error(status)
+
+        fake_client(fetch_many=not_found)
+        result = _cached_fetch(("P62988",), "uniprotkb", None, "json")
+        assert result["found"] == 0
+        assert result["requested"] == 1
+        assert result["invalid"] == []
+
+    def test_server_errors_propagate(self, fake_client):
+        """A 5xx from UniProt should raise instead of reporting IDs as missing."""
 
+        def server_error(ids: list[str]) -> list[dict[str, Any]]:
+            raise _http_error(503)
 
+        fake_client(fetch_many=server_error)
+        with pytest.raises(requests.HTTPError):
+            _cached_fetch(("P62988",), "uniprotkb", None, "json")
+
+
+BULK_FETCH_IDS = ["P62988", "A0A0C5B5G6", "A0A1B0GTW7"]
+
+
+@pytest.fixture(scope="session")
+def bulk_search() -> dict[str, Any]:
+    """One BRCA1 search shared by the search integration tests."""
+    return _uniprot_search_impl(
+        query="gene:BRCA1 AND organism_id:9606",
+        fields=["accession", "gene_names"],
+        limit=5,
+        response_format="json",
+    )
+
+
+@pytest.fixture(scope="session")
+def bulk_fetch() -> dict[str, Any]:
+    """One fetch of all known IDs shared by the fetch integration tests."""
+    return _uniprot_fetch_impl(ids=BULK_FETCH_IDS, response_format="json")
+
+
+def _accessions(result: dict[str, Any]) -> set[str]:
+    return {entry.get("primaryAccession") for entry in result["results"]}
+
+
+@pytest.mark.xdist_group("uniprot_net")
 class TestUniprotSearchIntegration:
     """Integration tests for uniprot_search (requires network)."""
 
     @pytest.mark.integration
     @skip_integration
-    def test_basic_search(self):
+    def test_basic_search(self, bulk_search):
         """Basic search should return results."""
-        result = _uniprot_search_impl(query="gene:BRCA1 AND organism_id:9606", limit=5, response_format="json")
-        assert isinstance(result, dict)
-        assert "results" in result
-        assert isinstance(result["results"], list)
-        assert len(result["results"]) <= 5
+        assert isinstance(bulk_search, dict)
+        assert "results" in bulk_search
+        assert isinstance(bulk_search["results"], list)
+        assert len(bulk_search["results"]) <= 5
 
     @pytest.mark.integration
     @skip_integration
-    def test_search_with_fields(self):
+    def test_search_with_fields(self, bulk_search):
         """Search with specific fields should limit returned data."""
-        result = _uniprot_search_impl(
-            query="accession:P62988",
-            fields=["accession", "gene_names"],
-            limit=1,
-            response_format="json",
-        )
-        assert isinstance(result, dict)
-        assert "results" in result
-        if result["results"]:
-            entry = result["results"][0]
+        for entry in bulk_search["results"]:
             # Should have the requested fields
             assert "primaryAccession" in entry or "accession" in entry
 
+    @pytest.mark.integration
+    @skip_integration
+    @pytest.mark.parametrize("limit", [2, 5])
+    def test_cursor_pages_are_disjoint(self, limit):
+        """Following nextCursor should return the next, non-overlapping page."""
+        query = "organism_id:9606 AND reviewed:true"
+        first = _uniprot_search_impl(query=query, limit=limit, fields=["accession"])
+        cursor = first["nextCursor"]
+        # The cursor is a compact fixed-width token, not accumulated state
+        assert len(cursor.encode("ascii")) < 256
+        second = _uniprot_search_impl(
+            query=query, limit=limit, fields=["accession"], cursor=cursor
+        )
+        assert len(second["results"]) == limit
+        assert not _accessions(first) & _accessions(second)
+
 
+@pytest.mark.xdist_group("uniprot_net")
 class TestUniprotFetchIntegration:
     """Integration tests for uniprot_fetch (requires network)."""
 
     @pytest.mark.integration
     @skip_integration
-    def test_fetch_single_id(self):
-        """Fetching a single ID should return one result."""
-        result = _uniprot_fetch_impl(ids=["P62988"], response_format="json")
-        assert isinstance(result, dict)
-        assert "results" in result
-        assert result["found"] == 1
-        assert result["requested"] == 1
+    def test_fetch_single_id(self, bulk_fetch):
+        """A single requested ID should appear exactly once."""
+        matches = [
+            entry
+            for entry in bulk_fetch["results"]
+            if entry.get("primaryAccession") == "P62988"
+        ]
+        assert len(matches) == 1
 
     @pytest.mark.integration
     @skip_integration
-    def test_fetch_multiple_ids(self):
-        """Fetching multiple IDs should return multiple results."""
-        result = _uniprot_fetch_impl(ids=["A0A0C5B5G6", "A0A1B0GTW7"], response_format="json")
-        assert isinstance(result, dict)
-        assert "results" in result
-        assert result["requested"] == 2
-        assert result["found"] <= 2
+    @pytest.mark.parametrize("accession", ["A0A0C5B5G6", "A0A1B0GTW7"])
+    def test_fetch_multiple_ids(self, bulk_fetch, accession):
+        """Each of several requested IDs should be returned."""
+        assert bulk_fetch["requested"] == len(BULK_FETCH_IDS)
+        assert accession in _accessions(bulk_fetch)
 
     @pytest.mark.integration
     @skip_integration
     def test_fetch_nonexistent_id(self):
         """Fetching nonexistent ID should return empty results."""
+        # Malformed, so rejected before any request is made
         result = _uniprot_fetch_impl(ids=["NOTREAL123"], response_format="json")
         assert isinstance(result, dict)
         assert result["found"] == 0
         assert result["requested"] == 1
-
+        assert result["invalid"] == ["NOTREAL123"]